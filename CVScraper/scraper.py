@@ -1,13 +1,41 @@
 import asyncio
 import aiohttp #type: ignore
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import logging
+import re
 import random
 import argparse
+import hashlib
+import os
+import time
+from pathlib import Path
 from aiohttp import ClientError #type: ignore
 from tqdm.asyncio import tqdm_asyncio #type: ignore
 
+# Prefer the C-based lxml parser, falling back to the builtin parser if it isn't installed
+try:
+    import lxml  #type: ignore # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional faster JSON encoder/decoder, the standard library json module is used without it
+try:
+    import orjson  #type: ignore
+except ImportError:
+    orjson = None  #type: ignore
+
+# Only build the parts of the page that are read: the question/answer posts and the question listing
+_POST_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)(?:js-question|js-answer)(?:\s|$)"))
+_LISTING_STRAINER = SoupStrainer(id="questions")
+
+# On-disk cache of fetched pages keyed by the sha1 of the URL, so an interrupted run can be resumed without refetching:
+# listing pages for a day, question pages (which rarely change) for a week, the same policy as WebScraper
+CACHE_DIR = Path(".scrape_cache")
+CACHE_EXPIRE_AFTER = 7 * 86400
+LISTING_EXPIRE_AFTER = 86400
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -28,18 +56,47 @@ class RateLimiter:
                     await asyncio.sleep(sleep_time)
             await self.request_times.put(now)
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def _cache_path(url):
+    return CACHE_DIR / (hashlib.sha1(url.encode()).hexdigest() + ".html")
+
+def read_cached_page(url):
+    cache_path = _cache_path(url)
+    try:
+        expire_after = LISTING_EXPIRE_AFTER if "/questions?" in url else CACHE_EXPIRE_AFTER
+        if time.time() - cache_path.stat().st_mtime < expire_after:
+            return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    return None
+
+def write_cached_page(url, text):
+    CACHE_DIR.mkdir(exist_ok=True)
+    # Write to a temporary file first, so an interrupted write never leaves a truncated page to be served
+    cache_path = _cache_path(url)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
 async def backoff_request(session, url, rate_limiter, max_retries=5, initial_delay=1):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    # Cached pages skip the rate limiter and the network entirely
+    cached = read_cached_page(url)
+    if cached is not None:
+        return cached
     
     for attempt in range(max_retries):
         try:
             await rate_limiter.acquire()
-            async with session.get(url, headers=headers) as response:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 response.raise_for_status()
-                return await response.text()
-        except ClientError as e:
+                text = await response.text()
+                write_cached_page(url, text)
+                return text
+        # The total timeout raises a plain asyncio.TimeoutError rather than a ClientError, retry it the same way
+        except (ClientError, asyncio.TimeoutError) as e:
             if attempt == max_retries - 1:
                 logging.error(f"Failed to fetch {url} after {max_retries} attempts: {str(e)}")
                 raise
@@ -47,6 +104,17 @@ async def backoff_request(session, url, rate_limiter, max_retries=5, initial_del
             logging.warning(f"Attempt {attempt + 1} failed. Retrying in {delay:.2f} seconds...")
             await asyncio.sleep(delay)
 
+def write_json(data, path):
+    """
+    Write data to path as indented UTF-8 JSON, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(path, "wb") as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+
 def json_items(question, answers):
     return {
         "question": question,
@@ -59,10 +127,10 @@ def contains_code_tag(html):
 async def fetch_question(session, question_link, rate_limiter):
     q_link = "https://stats.stackexchange.com" + question_link
     q_page = await backoff_request(session, q_link, rate_limiter)
-    document = BeautifulSoup(q_page, "html.parser")
+    document = BeautifulSoup(q_page, HTML_PARSER, parse_only=_POST_STRAINER)
     
     q = document.find(id="question").find(class_="js-post-body")
-    q_body = str(q)
+    q_body = q.decode_contents()
     
     if contains_code_tag(q_body):
         return None
@@ -74,7 +142,7 @@ async def fetch_question(session, question_link, rate_limiter):
         answer_score = answer[0].find(class_="fs-subheading")
         if answer_score and int(answer_score.get_text(strip=True)) > 0:
             a = answer[0].find(class_="js-post-body")
-            a_body = str(a)
+            a_body = a.decode_contents()
             
             if contains_code_tag(a_body):
                 return None
@@ -86,7 +154,7 @@ async def fetch_question(session, question_link, rate_limiter):
 async def fetch_page(session, page_number, rate_limiter):
     url = f"https://stats.stackexchange.com/questions?tab=votes&pagesize=50&page={page_number}"
     page = await backoff_request(session, url, rate_limiter)
-    soup = BeautifulSoup(page, "html.parser")
+    soup = BeautifulSoup(page, HTML_PARSER, parse_only=_LISTING_STRAINER)
     
     results = soup.find(id="questions")
     questions = results.find_all(class_="s-link")
@@ -101,15 +169,16 @@ async def scrape_page_range(session, start_page, end_page, rate_limiter):
     
     items = [item for page_items in results for item in page_items]
     
-    with open(f"data/page{start_page}-{end_page}.json", "w", encoding="utf-8") as file:
-        json.dump(items, file, indent=4, ensure_ascii=False)
+    write_json(items, f"data/page{start_page}-{end_page}.json")
 
 async def main():
     pages = [1, 102, 203, 304, 405, 506, 607, 708, 809, 910, 1011, 1112]
     
     rate_limiter = RateLimiter(rate_limit=6, period=8)  # 6 requests per 8 seconds
 
-    async with aiohttp.ClientSession() as session:
+    # One pooled session (keep-alive, shared headers) reused for every page range
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=32)
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
         for page in pages:
             await scrape_page_range(session, page, page + 100, rate_limiter)
             await asyncio.sleep(10)  # Add a delay between page ranges to avoid overloading
@@ -1,40 +1,245 @@
 import json
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag, NavigableString, CData
 import html
-from typing import List, Dict, Tuple
-from collections import Counter
+from typing import List, Dict, Tuple, Optional, cast
+from collections import Counter, OrderedDict
+import functools
 from sklearn.feature_extraction.text import CountVectorizer
 import numpy as np
+import pandas as pd
+from scipy import sparse
 from pathlib import Path
 import pickle
 import unicodedata
+import argparse
+
+# Prefer the C-based lxml parser, falling back to the builtin parser if it isn't installed
+try:
+    import lxml  #type: ignore # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional faster JSON encoder/decoder, the standard library json module is used without it
+try:
+    import orjson  #type: ignore
+except ImportError:
+    orjson = None  #type: ignore
+
+# Optional streaming JSON parser, without it every file goes through the repair pipeline
+try:
+    import ijson  #type: ignore
+except ImportError:
+    ijson = None
+
+# Precompiled patterns used on every entry
+_WS_RE = re.compile(r'\s+')
+_PY_COMMENT_RE = re.compile(r'#.*$', re.MULTILINE)
+_C_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+_SPECIAL_RE = re.compile(r'([^\w\s])')
+# Any run of characters other than lowercase letters, digits and periods, whitespace included
+_TEXT_CLEAN_RE = re.compile(r'[^a-z0-9.]+')
+# Next character _fix_json_commas has to look at, outside and inside of a JSON string
+_JSON_STRUCTURAL_RE = re.compile(r'["},]')
+_JSON_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_UNESCAPED_SLASH_RE = re.compile(r'(?<!\\)/')
+
+# Mapping of escaped JSON characters, applied in a single pass by _UNESCAPE_RE
+_UNESCAPE_MAP = {
+    '\\"': '"',    # Escaped quotation mark
+    '\\n': ' ',    # Newline to space
+    '\\t': ' ',    # Tab to space
+    '\\r': ' ',    # Carriage return to space
+    '\\\\': '\\',  # Escaped backslash
+    '\\/': '/'     # Escaped forward slash
+}
+_UNESCAPE_RE = re.compile(r'\\[ntr"\\/]')
+
+# Characters escaped by sanitize_code_block, backslashes are handled in the same pass so nothing is double escaped
+_SANITIZE_TABLE = str.maketrans({
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t'
+})
+
+# Bounds for the extract_code_and_text cache, larger inputs are parsed without being cached
+_EXTRACT_CACHE_SIZE = 4096
+_EXTRACT_CACHE_MAX_INPUT = 64 * 1024
+
+@functools.lru_cache(maxsize=8192)
+def _cached_html_unescape(text: str) -> str:
+    """
+    html.unescape memoised across the verbatim duplicate strings common in scraped data
+    """
+    return html.unescape(text)
+
+def _strip_block_comments(code: str) -> str:
+    """
+    Remove /* ... */ comments with a linear str.find scan, an unterminated comment is left as is
+    """
+    out = []
+    i = 0
+    while True:
+        j = code.find('/*', i)
+        if j < 0:
+            out.append(code[i:])
+            break
+        k = code.find('*/', j + 2)
+        if k < 0:
+            out.append(code[i:])
+            break
+        out.append(code[i:j])
+        i = k + 2
+    return ''.join(out)
+
+def _replace_code_blocks(content: str, replace) -> str:
+    """
+    Replace the inside of every <code>...</code> span with replace(inner) using a linear str.find scan
+    """
+    out = []
+    i = 0
+    while True:
+        j = content.find('<code>', i)
+        if j < 0:
+            out.append(content[i:])
+            break
+        k = content.find('</code>', j + 6)
+        if k < 0:
+            out.append(content[i:])
+            break
+        out.append(content[i:j + 6])
+        out.append(replace(content[j + 6:k]))
+        out.append('</code>')
+        i = k + 7
+    return ''.join(out)
+
+def _split_code_and_text_tags(root: Tag) -> Tuple[List[Tag], List[Tag]]:
+    """
+    Walks the tree once in document order, collecting the outermost <code> tags and the <p>/<a> tags outside of them
+    """
+    code_tags = []
+    text_tags = []
+    stack = [iter(root.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag):
+                if child.name == 'code':
+                    code_tags.append(child)
+                else:
+                    if child.name in ('p', 'a'):
+                        text_tags.append(child)
+                    stack.append(iter(child.children))
+                    break
+        else:
+            stack.pop()
+    return code_tags, text_tags
+
+def _text_outside_code(tag: Tag) -> str:
+    """
+    Equivalent of tag.get_text(strip=True) with the text of any <code> descendants left out
+    """
+    # Most tags hold nothing or a single string, which needs no walk
+    if not tag.contents:
+        return ''
+    if len(tag.contents) == 1 and type(tag.contents[0]) in (NavigableString, CData):
+        return cast(NavigableString, tag.contents[0]).strip()
+    
+    parts = []
+    stack = [iter(tag.children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag):
+                if child.name != 'code':
+                    stack.append(iter(child.children))
+                    break
+            elif type(child) in (NavigableString, CData):
+                stripped = cast(NavigableString, child).strip()
+                if stripped:
+                    parts.append(stripped)
+        else:
+            stack.pop()
+    return ''.join(parts)
+
+def _fix_json_commas(content: str) -> str:
+    """
+    Insert the commas missing between adjacent objects (} {) and drop trailing commas (, } and , ])
+    in a single forward scan. Characters inside JSON strings are left alone.
+    """
+    out = []
+    n = len(content)
+    pos = 0  # Start of the input not yet copied to out
+    i = 0
+    in_string = False
+    while True:
+        match = (_JSON_STRING_SPECIAL_RE if in_string else _JSON_STRUCTURAL_RE).search(content, i)
+        if match is None:
+            break
+        i = match.start()
+        char = content[i]
+        
+        if in_string:
+            # Skip over the escaped character, or leave the string on the closing quote
+            i += 2 if char == '\\' else 1
+            in_string = char == '\\'
+            continue
+        if char == '"':
+            in_string = True
+            i += 1
+            continue
+        
+        j = i + 1
+        while j < n and content[j].isspace():
+            j += 1
+        if char == '}' and j < n and content[j] == '{':
+            # Missing comma, the whitespace between the objects is dropped
+            out.append(content[pos:i])
+            out.append('},{')
+            pos = i = j + 1
+        elif char == ',' and j < n and content[j] in '}]':
+            # Trailing comma, the whitespace after it is kept
+            out.append(content[pos:i])
+            pos = i = i + 1
+        else:
+            i += 1
+    out.append(content[pos:])
+    return ''.join(out)
+
+def write_json(data, path):
+    """
+    Write data to path as indented UTF-8 JSON, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(path, 'wb') as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+
 
 class DataPreprocessor:
-    def __init__(self, min_word_freq = 2, max_vocab_size=50000):
+    def __init__(self, min_word_freq = 2, max_vocab_size=50000, debug: bool = False):
         self.min_word_freq = min_word_freq
+        # Write the intermediate repair pipeline files to a debug directory next to the input
+        self.debug = debug
         self.max_vocab_size = max_vocab_size
-        self.code_vectoriser = CountVectorizer(token_pattern=r'[A-Za-z_][A-Za-z0-9_]*|\S+', max_features=max_vocab_size)
-        self.text_vectoriser = CountVectorizer(max_features=max_vocab_size)
+        self.code_vectoriser = CountVectorizer(token_pattern=r'[A-Za-z_][A-Za-z0-9_]*|\S+', max_features=max_vocab_size, dtype=np.int32)
+        self.text_vectoriser = CountVectorizer(max_features=max_vocab_size, dtype=np.int32)
+        # Vocabulary sizes, set once the vectorisers are fitted
+        self._code_vsize = 0
+        self._text_vsize = 0
+        # LRU cache of extract_code_and_text results keyed by the HTML content
+        self._extract_cache: OrderedDict[str, Tuple[Tuple[str, str], ...]] = OrderedDict()
     
     def unescape_json(self, text):
         """
         Unescape JSON escaped characters.
         Example: \" -> ", \n -> newline, \t -> tab
         """
-        # Define mapping of escaped characters
-        escape_mapping = {
-            '\\"': '"',    # Escaped quotation mark
-            '\\n': ' ',    # Newline to space
-            '\\t': ' ',    # Tab to space
-            '\\r': ' ',    # Carriage return to space
-            '\\\\': '\\',  # Escaped backslash
-            '\\/': '/'     # Escaped forward slash
-        }
-        
-        # Replace each escaped character
-        for escaped, unescaped in escape_mapping.items():
-            text = text.replace(escaped, unescaped)
+        # Replace every escaped character in one scan
+        text = _UNESCAPE_RE.sub(lambda match: _UNESCAPE_MAP[match.group(0)], text)
             
         return text
     
@@ -42,7 +247,7 @@ class DataPreprocessor:
         """
         Decode HTML entities and convert them to ASCII characters. An example would be &gt; is set to >
         """
-        return html.unescape(text)
+        return _cached_html_unescape(text)
     
     def clean_text(self, text):
         """
@@ -60,9 +265,21 @@ class DataPreprocessor:
         # Decode HTML entities
         text = self.decode_html(text)
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WS_RE.sub(' ', text).strip()
         return text
     
+    def clean_text_series(self, series):
+        """
+        Vectorised clean_text over a pandas Series, non-string values become empty strings
+        """
+        text = series.where(series.map(lambda value: isinstance(value, str)), "")
+        # Unescape JSON characters first
+        text = text.str.replace(_UNESCAPE_RE, lambda match: _UNESCAPE_MAP[match.group(0)], regex=True)
+        # Decode HTML entities
+        text = text.map(_cached_html_unescape)
+        # Normalize whitespace
+        return text.str.replace(_WS_RE, ' ', regex=True).str.strip()
+    
     def preprocess_code(self, code):
         """
         Preprocesses code by:
@@ -75,15 +292,15 @@ class DataPreprocessor:
         code = self.unescape_json(code)
         
         # Remove comments
-        code = re.sub(r'#.*$', '', code, flags=re.MULTILINE)  # Python comments
-        code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)  # Single line comments
-        code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)  # Multi-line comments
+        code = _PY_COMMENT_RE.sub('', code)  # Python comments
+        code = _C_COMMENT_RE.sub('', code)  # Single line comments
+        code = _strip_block_comments(code)  # Multi-line comments
         
         # Normalize whitespace
-        code = re.sub(r'\s+', ' ', code)
+        code = _WS_RE.sub(' ', code)
         
         # Tokenize special characters
-        code = re.sub(r'([^\w\s])', r' \1 ', code)
+        code = _SPECIAL_RE.sub(r' \1 ', code)
         
         return code.strip()
     
@@ -92,47 +309,87 @@ class DataPreprocessor:
         Preprocesses text by:
         1. Unescaping JSON characters
         2. Converting to lowercase
-        3. Removing special characters
-        4. Normalizing whitespace
+        3. Removing special characters and normalizing whitespace
         """
         # Unescape JSON characters first
         text = self.unescape_json(text)
         # Convert to lowercase
         text = text.lower()
-        # Remove special characters except periods and spaces
-        text = re.sub(r'[^a-z0-9\s\.]', ' ', text)
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove special characters except periods and normalize whitespace in one pass
+        text = _TEXT_CLEAN_RE.sub(' ', text)
         
         return text.strip()
     
-    def extract_code_and_text(self, html_content):
+    def iter_code_and_text(self, html_content):
         """
         This method separtes the code blocks from the regular text.
-        It returns a list of code_blocks and a list of text_blocks
+        html_content is either an HTML string or an already parsed BeautifulSoup Tag.
+        It lazily yields ('code', block) and ('text', block) pairs, every code block before the text blocks
         """
         
-        soup = BeautifulSoup(html_content, "html.parser")
+        if isinstance(html_content, Tag):
+            # Reuse the parsed tree instead of parsing it again, it is only read
+            cacheable = False
+            soup = html_content
+        else:
+            cacheable = len(html_content) <= _EXTRACT_CACHE_MAX_INPUT
+            if cacheable and html_content in self._extract_cache:
+                self._extract_cache.move_to_end(html_content)
+                yield from self._extract_cache[html_content]
+                return
+            
+            soup = BeautifulSoup(html_content, HTML_PARSER)
+        
+        # Only collect the pairs when they are going to be cached
+        blocks: Optional[List[Tuple[str, str]]] = [] if cacheable else None
+        
+        code_tags, text_tags = _split_code_and_text_tags(soup)
         
         # Extract the code blocks
-        code_blocks = []
-        code_tags = soup.find_all('code')
         for code in code_tags:
-            code_text = code.get_text(strip=True)
+            # .string is O(1) for the usual single-string <code>, otherwise fall back to the full walk
+            string = code.string
+            code_text = string.strip() if type(string) in (NavigableString, CData) else code.get_text(strip=True)
             if code_text:
-                code_blocks.append(code_text)
-            code.decompose()
+                if blocks is not None:
+                    blocks.append(('code', code_text))
+                yield ('code', code_text)
         
-        # Extract the text and links
-        text_blocks = []
-        text_links = soup.find_all(['p','a'])
-        for text in text_links:
-            plain_text = text.get_text(strip=True)
+        # Extract the text and links, leaving out the code they contain instead of removing it from the tree
+        for text in text_tags:
+            plain_text = _text_outside_code(text)
             if plain_text:
-                text_blocks.append(plain_text)
+                if blocks is not None:
+                    blocks.append(('text', plain_text))
+                yield ('text', plain_text)
+        
+        if blocks is not None:
+            self._extract_cache[html_content] = tuple(blocks)
+            if len(self._extract_cache) > _EXTRACT_CACHE_SIZE:
+                self._extract_cache.popitem(last=False)
+    
+    def extract_code_and_text(self, html_content):
+        """
+        This method separtes the code blocks from the regular text.
+        It returns a list of code_blocks and a list of text_blocks
+        """
+        code_blocks = []
+        text_blocks = []
+        for kind, block in self.iter_code_and_text(html_content):
+            (code_blocks if kind == 'code' else text_blocks).append(block)
                 
         return code_blocks, text_blocks
     
+    def add_code_and_text(self, processed_entry, html_content, code_field, text_field):
+        """
+        Preprocesses the code and text blocks of html_content straight into the processed entry's fields
+        """
+        for kind, block in self.iter_code_and_text(html_content):
+            if kind == 'code':
+                processed_entry[code_field].append(self.preprocess_code(block))
+            else:
+                processed_entry[text_field].append(self.preprocess_text(block))
+    
     def create_vocabulary(self, processed_data):
         """
         Creates separate vocabularies for code and text based on processed data.
@@ -150,6 +407,8 @@ class DataPreprocessor:
         # Fit vectorizers
         self.code_vectoriser.fit(all_code)
         self.text_vectoriser.fit(all_text)
+        self._code_vsize = len(self.code_vectoriser.vocabulary_)
+        self._text_vsize = len(self.text_vectoriser.vocabulary_)
     
     def transform_to_bag_of_words_data(self, processed_entry):
         """
@@ -157,49 +416,66 @@ class DataPreprocessor:
         """
         bag_of_words_data = {}
         
-        # Transform code
-        if processed_entry['question_code']:
-            bag_of_words_data['question_code'] = self.code_vectoriser.transform(processed_entry['question_code']).toarray().sum(axis=0)
-        else:
-            bag_of_words_data['question_code'] = np.zeros(len(self.code_vectoriser.vocabulary_))
-            
-        if processed_entry['answer_code']:
-            bag_of_words_data['answer_code'] = self.code_vectoriser.transform(
-                processed_entry['answer_code']
-            ).toarray().sum(axis=0)
-        else:
-            bag_of_words_data['answer_code'] = np.zeros(len(self.code_vectoriser.vocabulary_))
+        for field, vectoriser, vocab_size in self._bag_of_words_fields():
+            if processed_entry[field]:
+                # Sum in the sparse domain rather than densifying every document first
+                bag_of_words_data[field] = np.asarray(vectoriser.transform(processed_entry[field]).sum(axis=0, dtype=np.int32)).ravel()
+            else:
+                bag_of_words_data[field] = np.zeros(vocab_size, dtype=np.int32)
         
-        # Transform text
-        if processed_entry['question_text']:
-            bag_of_words_data['question_text'] = self.text_vectoriser.transform(processed_entry['question_text']).toarray().sum(axis=0)
-        else:
-            bag_of_words_data['question_text'] = np.zeros(len(self.text_vectoriser.vocabulary_))
+        return bag_of_words_data
+    
+    def transform_dataset_to_bag_of_words(self, processed_data):
+        """
+        Transforms every processed entry into bag-of-words representations.
+        Each field is transformed with a single call over the documents of all entries, and the
+        per-entry counts are summed with one sparse matrix product.
+        """
+        bag_of_words_dataset = [{} for _ in processed_data]
+        
+        for field, vectoriser, vocab_size in self._bag_of_words_fields():
+            docs = []
+            owners = []
+            for i, entry in enumerate(processed_data):
+                docs.extend(entry.get(field, []))
+                owners.extend([i] * len(entry.get(field, [])))
             
-        if processed_entry['answer_text']:
-            bag_of_words_data['answer_text'] = self.text_vectoriser.transform(processed_entry['answer_text']).toarray().sum(axis=0)
-        else:
-            bag_of_words_data['answer_text'] = np.zeros(len(self.text_vectoriser.vocabulary_))
+            if docs:
+                counts = vectoriser.transform(docs)
+                # Row i of the indicator selects the documents belonging to entry i
+                indicator = sparse.csr_matrix(
+                    (np.ones(len(owners), dtype=counts.dtype), (owners, np.arange(len(owners)))),
+                    shape=(len(processed_data), len(docs))
+                )
+                summed = (indicator @ counts).toarray()
+            else:
+                summed = np.zeros((len(processed_data), vocab_size), dtype=np.int32)
+            
+            for i, bag_of_words_data in enumerate(bag_of_words_dataset):
+                bag_of_words_data[field] = summed[i]
         
-        return bag_of_words_data
+        return bag_of_words_dataset
+    
+    def _bag_of_words_fields(self):
+        """
+        Pairs each processed field with the vectoriser used for it and that vectoriser's vocabulary size.
+        """
+        return [
+            ('question_code', self.code_vectoriser, self._code_vsize),
+            ('answer_code', self.code_vectoriser, self._code_vsize),
+            ('question_text', self.text_vectoriser, self._text_vsize),
+            ('answer_text', self.text_vectoriser, self._text_vsize)
+        ]
     
     def sanitize_code_block(self, code: str) -> str:
         """
         Sanitize a code block to make it JSON-safe
         """
-        # Replace all backslashes first to prevent double escaping
-        code = code.replace('\\', '\\\\')
-        
-        # Escape quotes
-        code = code.replace('"', '\\"')
-        
-        # Replace newlines and other whitespace
-        code = code.replace('\n', '\\n')
-        code = code.replace('\r', '\\r')
-        code = code.replace('\t', '\\t')
+        # Escape backslashes, quotes, newlines and other whitespace
+        code = code.translate(_SANITIZE_TABLE)
         
         # Escape forward slashes in file paths
-        code = re.sub(r'(?<!\\)/', '\\/', code)
+        code = _UNESCAPED_SLASH_RE.sub('\\/', code)
         
         return code
 
@@ -207,13 +483,8 @@ class DataPreprocessor:
         """
         Process all code blocks in the content to make them JSON-safe
         """
-        def replace_code_block(match):
-            code = match.group(1)
-            sanitized_code = self.sanitize_code_block(code)
-            return f'<code>{sanitized_code}</code>'
-        
         # Process each code block
-        content = re.sub(r'<code>(.*?)</code>', replace_code_block, content, flags=re.DOTALL)
+        content = _replace_code_blocks(content, self.sanitize_code_block)
         return content
 
     def fix_json_structure(self, content: str) -> str:
@@ -229,11 +500,8 @@ class DataPreprocessor:
         if not content.endswith(']'):
             content = content + ']'
         
-        # Fix missing commas between objects
-        content = re.sub(r'}\s*{', '},{', content)
-        
-        # Remove trailing commas
-        content = re.sub(r',(\s*[}\]])', r'\1', content)
+        # Fix missing commas between objects and remove trailing commas
+        content = _fix_json_commas(content)
         
         return content
 
@@ -253,37 +521,44 @@ class DataPreprocessor:
         except Exception:
             return False
 
-    def preprocess_file(self, file_path: str) -> str:
+    def preprocess_file(self, file_path: str, debug: Optional[bool] = None) -> str:
         """
-        Preprocess the JSON file with detailed error checking
+        Preprocess the JSON file with detailed error checking.
+        The intermediate results are only written when debug (defaulting to self.debug) is set
         """
+        if debug is None:
+            debug = self.debug
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Create a debug directory
-            debug_dir = Path(file_path).parent / 'debug'
-            debug_dir.mkdir(exist_ok=True)
-            
-            # Save original content for comparison
-            with open(debug_dir / 'original.txt', 'w', encoding='utf-8') as f:
-                f.write(content)
+            if debug:
+                # Create a debug directory
+                debug_dir = Path(file_path).parent / 'debug'
+                debug_dir.mkdir(exist_ok=True)
+                
+                # Save original content for comparison
+                with open(debug_dir / 'original.txt', 'w', encoding='utf-8') as f:
+                    f.write(content)
             
             # Process code blocks
             print("Processing code blocks...")
             content = self.process_code_blocks(content)
             
-            # Save intermediate result
-            with open(debug_dir / 'after_code_processing.txt', 'w', encoding='utf-8') as f:
-                f.write(content)
+            if debug:
+                # Save intermediate result
+                with open(debug_dir / 'after_code_processing.txt', 'w', encoding='utf-8') as f:
+                    f.write(content)
             
             # Fix JSON structure
             print("Fixing JSON structure...")
             content = self.fix_json_structure(content)
             
-            # Save preprocessed content
-            with open(debug_dir / 'preprocessed.json', 'w', encoding='utf-8') as f:
-                f.write(content)
+            if debug:
+                # Save preprocessed content
+                with open(debug_dir / 'preprocessed.json', 'w', encoding='utf-8') as f:
+                    f.write(content)
             
             return content
             
@@ -291,30 +566,57 @@ class DataPreprocessor:
             print(f"Error preprocessing file {file_path}: {str(e)}")
             raise
 
+    def validate_json_entries(self, entries) -> List[Dict]:
+        """
+        Keep the valid entries of an iterable of parsed entries
+        """
+        validated_data = []
+        for i, entry in enumerate(entries):
+            if self.validate_json_entry(entry):
+                validated_data.append(entry)
+            else:
+                print(f"Warning: Skipping invalid entry at index {i}")
+        
+        if not validated_data:
+            raise ValueError("No valid entries found in the JSON file")
+        
+        return validated_data
+
+    def stream_json_entries(self, file_path: str) -> List[Dict]:
+        """
+        Stream-parse a well-formed JSON file one entry at a time.
+        Handles both a top-level list of entries and the scrapers' {"items": [...]} layout.
+        """
+        with open(file_path, 'rb') as f:
+            # Peek at the first character to find where the entries live
+            head = f.read(64).lstrip(b'\xef\xbb\xbf \t\r\n')
+            prefix = 'items.item' if head.startswith(b'{') else 'item'
+            f.seek(0)
+            
+            return self.validate_json_entries(ijson.items(f, prefix))
+
     def load_json_safely(self, file_path: str) -> List[Dict]:
         """
         Load and parse JSON content with extensive error handling
         """
         try:
+            # Well-formed files are streamed directly, skipping the repair pipeline
+            if ijson is not None:
+                try:
+                    return self.stream_json_entries(file_path)
+                except (ijson.JSONError, ValueError):
+                    # Not well-formed, or well-formed but without entries where the stream looks for them,
+                    # e.g. a single top-level entry, which the repair pipeline wraps in a list
+                    print("File is not a well-formed list of entries, falling back to the repair pipeline")
+            
             # Preprocess the file
             content = self.preprocess_file(file_path)
             
             try:
                 # Try to parse the JSON
-                data = json.loads(content)
-                
-                # Validate each entry
-                validated_data = []
-                for i, entry in enumerate(data):
-                    if self.validate_json_entry(entry):
-                        validated_data.append(entry)
-                    else:
-                        print(f"Warning: Skipping invalid entry at index {i}")
+                data = orjson.loads(content) if orjson is not None else json.loads(content)
                 
-                if not validated_data:
-                    raise ValueError("No valid entries found in the JSON file")
-                
-                return validated_data
+                return self.validate_json_entries(data)
                 
             except json.JSONDecodeError as e:
                 print(f"\nJSON decode error: {str(e)}")
@@ -328,13 +630,14 @@ class DataPreprocessor:
                 print(context)
                 print(" " * (min(200, e.pos - start)) + "^")
                 
-                # Save error details
-                debug_dir = Path(file_path).parent / 'debug'
-                with open(debug_dir / 'error_details.txt', 'w', encoding='utf-8') as f:
-                    f.write(f"Error position: {e.pos}\n")
-                    f.write(f"Error message: {str(e)}\n")
-                    f.write("\nContext:\n")
-                    f.write(context)
+                if self.debug:
+                    # Save error details
+                    debug_dir = Path(file_path).parent / 'debug'
+                    with open(debug_dir / 'error_details.txt', 'w', encoding='utf-8') as f:
+                        f.write(f"Error position: {e.pos}\n")
+                        f.write(f"Error message: {str(e)}\n")
+                        f.write("\nContext:\n")
+                        f.write(context)
                 
                 raise
                 
@@ -350,35 +653,30 @@ class DataPreprocessor:
         # Load and parse JSON data with better error handling
         data = self.load_json_safely(input_path)
         
+        # Clean every question and answer column-wise, answers are exploded to one row per answer
+        df = pd.DataFrame(data)
+        questions = self.clean_text_series(df['question'])
+        answers = self.clean_text_series(df['answers'].explode())
+        
         # Process all entries
         processed_data = []
-        for entry in data:
-            processed_entry = {}
+        for question in questions:
+            processed_entry = {'question_code': [], 'question_text': [], 'answer_code': [], 'answer_text': []}
             
             # Process question
-            if 'question' in entry:
-                question = self.clean_text(entry['question'])
-                code_blocks, text_blocks = self.extract_code_and_text(question)
-                processed_entry['question_code'] = [self.preprocess_code(code) for code in code_blocks]
-                processed_entry['question_text'] = [self.preprocess_text(text) for text in text_blocks]
-            
-            # Process answers
-            if 'answers' in entry:
-                processed_entry['answer_code'] = []
-                processed_entry['answer_text'] = []
-                for answer in entry['answers']:
-                    answer = self.clean_text(answer)
-                    code_blocks, text_blocks = self.extract_code_and_text(answer)
-                    processed_entry['answer_code'].extend(self.preprocess_code(code) for code in code_blocks)
-                    processed_entry['answer_text'].extend(self.preprocess_text(text) for text in text_blocks)
+            self.add_code_and_text(processed_entry, question, 'question_code', 'question_text')
             
             processed_data.append(processed_entry)
         
+        # Process answers, the exploded index is the position of the entry they belong to
+        for i, answer in answers.items():
+            self.add_code_and_text(processed_data[i], answer, 'answer_code', 'answer_text')
+        
         # Create vocabularies
         self.create_vocabulary(processed_data)
         
         # Transform to bag-of-words
-        bag_of_words_dataset = [self.transform_to_bag_of_words_data(entry) for entry in processed_data]
+        bag_of_words_dataset = self.transform_dataset_to_bag_of_words(processed_data)
         
         # Save processed data if output path is provided
         if output_path:
@@ -390,39 +688,44 @@ class DataPreprocessor:
                 pickle.dump(bag_of_words_dataset, f)
             
             # Save vocabularies
-            with open('PreprocessedData/code_vocabulary.json', 'w') as f:
-                json.dump(str(self.code_vectoriser.vocabulary_), f, indent=2)
+            write_json(str(self.code_vectoriser.vocabulary_), 'PreprocessedData/code_vocabulary.json')
                 
-            with open('PreprocessedData/text_vocabulary.json', 'w') as f:
-                json.dump(str(self.text_vectoriser.vocabulary_), f, indent=2)
+            write_json(str(self.text_vectoriser.vocabulary_), 'PreprocessedData/text_vocabulary.json')
             
             # Save a sample of processed entries for verification
-            with open('PreprocessedData/processed_samples.json', 'w', encoding='utf-8') as f:
-                json.dump(processed_data[:5], f, indent=2)
+            write_json(processed_data[:5], 'PreprocessedData/processed_samples.json')
         
         return bag_of_words_dataset
 
 def main():
+    parser = argparse.ArgumentParser(description="Preprocess the combined scraped data into bag-of-words representations")
+    parser.add_argument('--debug', action='store_true', help="Write the intermediate repair pipeline files to a debug directory")
+    args = parser.parse_args()
+    
     try:
         print("Initializing preprocessor...")
-        preprocessor = DataPreprocessor(min_word_freq=2, max_vocab_size=50000)
+        preprocessor = DataPreprocessor(min_word_freq=2, max_vocab_size=50000, debug=args.debug)
         
         input_path = '../WebScraper/data/combined_data.json'
         output_path = 'PreprocessedData/processed_data'
         
         print(f"\nProcessing file: {input_path}")
-        print("A debug directory will be created with intermediate results")
+        if args.debug:
+            print("A debug directory will be created with intermediate results")
         
         bag_of_words_dataset = preprocessor.process_file(input_path, output_path)
         print("\nProcessing completed successfully")
         
     except Exception as e:
         print(f"\nProcessing failed: {str(e)}")
-        print("\nDebug files have been created in the 'debug' directory next to your input file:")
-        print("- original.txt: Original file content")
-        print("- after_code_processing.txt: Content after processing code blocks")
-        print("- preprocessed.json: Final preprocessed JSON")
-        print("- error_details.txt: Detailed error information if JSON parsing failed")
+        if args.debug:
+            print("\nDebug files have been created in the 'debug' directory next to your input file:")
+            print("- original.txt: Original file content")
+            print("- after_code_processing.txt: Content after processing code blocks")
+            print("- preprocessed.json: Final preprocessed JSON")
+            print("- error_details.txt: Detailed error information if JSON parsing failed")
+        else:
+            print("\nRerun with --debug to write the intermediate results to a 'debug' directory next to your input file")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,31 +1,70 @@
 # Required imports
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import numpy as np
 import json
+import re
 from tqdm import tqdm
 import time
 from requests.exceptions import RequestException
 import logging
 import random
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-def backoff_request(url, max_retries=5, initial_delay=1):
+# Prefer the C-based lxml parser, falling back to the builtin parser if it isn't installed
+try:
+    import lxml  #type: ignore # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional faster JSON encoder/decoder, the standard library json module is used without it
+try:
+    import orjson  #type: ignore
+except ImportError:
+    orjson = None  #type: ignore
+
+# Only build the parts of the page that are read: the question/answer posts and the question listing
+_POST_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)(?:js-question|js-answer)(?:\s|$)"))
+_LISTING_STRAINER = SoupStrainer(id="questions")
+
+# Shared session so every request to stackoverflow.com reuses pooled keep-alive connections.
+# With requests-cache installed, responses are also cached on disk so an interrupted run can be resumed
+# without refetching: listing pages for a day, question pages (which rarely change) for a week.
+try:
+    import requests_cache  #type: ignore
+    _SESSION = requests_cache.CachedSession(
+        '.scrape_cache',
+        backend='sqlite',
+        expire_after=7 * 86400,
+        urls_expire_after={'stackoverflow.com/questions/tagged': 86400}
+    )
+except ImportError:
+    _SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+
+# Number of question pages fetched concurrently
+MAX_WORKERS = 8
+
+def backoff_request(url, max_retries=5, initial_delay=1, session=_SESSION):
     """
     Make HTTP requests with exponential backoff retry logic
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers)
+            response = session.get(url, timeout=10)
             response.raise_for_status()
             
-            # Add a small random delay between requests
-            time.sleep(random.uniform(1, 3))
+            # Add a small random delay between requests, the worker threads already overlap the latency
+            if not getattr(response, 'from_cache', False):
+                time.sleep(random.uniform(0.25, 0.75))
             
             return response
             
@@ -39,6 +78,17 @@ def backoff_request(url, max_retries=5, initial_delay=1):
             logging.warning(f"Attempt {attempt + 1} failed. Retrying in {delay:.2f} seconds...")
             time.sleep(delay)
 
+def write_json(data, path):
+    """
+    Write data to path as indented UTF-8 JSON, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(path, "wb") as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+
 def json_items(question, answers):
     return {
         "question": question,
@@ -46,163 +96,87 @@ def json_items(question, answers):
     }
 
 
-def scrape_ds():
-    items = []
+def _scrape_question(link, session=_SESSION):
+    """
+    Fetch a single question page and return (q_body, answers_list), or None if it has no usable answers
+    """
+    answers_list = []
     
-    for page_number in tqdm(range(0, 5)):
-        url = f"https://stackoverflow.com/questions/tagged/data-science?tab=votes&pagesize=50&page={page_number+1}"
-        
-        page = backoff_request(url)
-        soup = BeautifulSoup(page.text, "html.parser")
-        
-        results = soup.find(id="questions")
-        questions = results.find_all(class_="s-link")
-        
-        for question in tqdm(questions):
-            answers_list = []
-            question_link = question.get('href')
-            q_link = "https://stackoverflow.com" + question_link
-            
-            q_page = backoff_request(q_link)
-            document = BeautifulSoup(q_page.text, "html.parser")
-            
-            q = document.find(id="question").find(class_="js-post-body")
-            q_body = str(q)
-            
-            answers = document.find_all(class_="js-answer")
-            answer_count = 0
-            for answer in answers:
-                answer_score = answer.find(class_="fs-subheading")
-                if answer_score:
-                    if int(answer_score.get_text(strip=True)) <= 0 or answer_count >= 3:
-                        break
-                    
-                    a = answer.find(class_="js-post-body")
-                    a_body = str(a)
-                    answers_list.append(a_body)
-                    
-                    answer_count += 1
-                else:
-                    break
-                
-            if answers_list:
-                item = json_items(q_body, answers_list)
-                items.append(item)
+    q_page = backoff_request(link, session=session)
+    document = BeautifulSoup(q_page.text, HTML_PARSER, parse_only=_POST_STRAINER)
     
-    data = {
-        "items": items
-    }
-    with open("data/data_science.json", "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
-
-def scrape_ml():
-    items = []
+    q = document.find(id="question").find(class_="js-post-body")
+    q_body = q.decode_contents()
     
-    for page_number in tqdm(range(0, 8)):
-        url = f"https://stackoverflow.com/questions/tagged/machine-learning?tab=votes&pagesize=50&page={page_number+1}"
-        
-        page = backoff_request(url)
-        soup = BeautifulSoup(page.text, "html.parser")
-        
-        results = soup.find(id="questions")
-        questions = results.find_all(class_="s-link")
-        
-        for question in tqdm(questions):
-            answers_list = []
-            question_link = question.get('href')
-            q_link = "https://stackoverflow.com" + question_link
-            
-            q_page = backoff_request(q_link)
-            document = BeautifulSoup(q_page.text, "html.parser")
+    answers = document.find_all(class_="js-answer")
+    answer_count = 0
+    for answer in answers:
+        answer_score = answer.find(class_="fs-subheading")
+        if answer_score:
+            if int(answer_score.get_text(strip=True)) <= 0 or answer_count >= 3:
+                break
             
-            q = document.find(id="question").find(class_="js-post-body")
-            q_body = str(q)
+            a = answer.find(class_="js-post-body")
+            a_body = a.decode_contents()
+            answers_list.append(a_body)
             
-            answers = document.find_all(class_="js-answer")
-            answer_count = 0
-            for answer in answers:
-                answer_score = answer.find(class_="fs-subheading")
-                if answer_score:
-                    if int(answer_score.get_text(strip=True)) <= 0 or answer_count >= 3:
-                        break
-                    
-                    a = answer.find(class_="js-post-body")
-                    a_body = str(a)
-                    answers_list.append(a_body)
-                                        
-                    answer_count += 1
-                else:
-                    break
-                
-            if answers_list:
-                item = json_items(q_body, answers_list)
-                items.append(item)
+            answer_count += 1
+        else:
+            break
+    
+    if answers_list:
+        return q_body, answers_list
+    return None
+
+
+# Scraped tags: --tag value -> (StackOverflow tag, number of listing pages, output file)
+TAGS = {
+    "ds": ("data-science", 5, "data/data_science.json"),
+    "ml": ("machine-learning", 8, "data/machine_learning.json"),
+    "ai": ("artificial-intelligence", 8, "data/artificial_intelligence.json")
+}
+
+def scrape_tag(tag, n_pages, output_path, session=_SESSION, executor=None):
+    """
+    Scrape the top voted questions of a StackOverflow tag and write them to output_path.
+    Pass an executor to share one thread pool across several tags.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return scrape_tag(tag, n_pages, output_path, session, executor)
     
-    data = {
-        "items": items
-    }
-    with open("data/machine_learning.json", "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
-        
-def scrape_ai():
     items = []
     
-    for page_number in tqdm(range(0, 8)):
-        url = f"https://stackoverflow.com/questions/tagged/artificial-intelligence?tab=votes&pagesize=50&page={page_number+1}"
+    for page_number in tqdm(range(0, n_pages)):
+        url = f"https://stackoverflow.com/questions/tagged/{tag}?tab=votes&pagesize=50&page={page_number+1}"
         
-        page = backoff_request(url)
-        soup = BeautifulSoup(page.text, "html.parser")
+        page = backoff_request(url, session=session)
+        soup = BeautifulSoup(page.text, HTML_PARSER, parse_only=_LISTING_STRAINER)
         
         results = soup.find(id="questions")
         questions = results.find_all(class_="s-link")
         
-        for question in tqdm(questions):
-            answers_list = []
-            question_link = question.get('href')
-            q_link = "https://stackoverflow.com" + question_link
-            
-            q_page = backoff_request(q_link)
-            document = BeautifulSoup(q_page.text, "html.parser")
-            
-            q = document.find(id="question").find(class_="js-post-body")
-            q_body = str(q)
-            
-            answers = document.find_all(class_="js-answer")
-            answer_count = 0
-            for answer in answers:
-                answer_score = answer.find(class_="fs-subheading")
-                if answer_score:
-                    if int(answer_score.get_text(strip=True)) <= 0 or answer_count >= 3:
-                        break
-                    
-                    a = answer.find(class_="js-post-body")
-                    a_body = str(a)
-                    answers_list.append(a_body)
-                    
-                    answer_count += 1
-                else:
-                    break
-            if answers_list:
-                item = json_items(q_body, answers_list)
-                # item = json_items(q, answers_list)
+        links = ["https://stackoverflow.com" + question.get('href') for question in questions]
+        for result in tqdm(executor.map(partial(_scrape_question, session=session), links), total=len(links)):
+            if result:
+                item = json_items(*result)
                 items.append(item)
     
     data = {
         "items": items
     }
-    with open("data/artificial_intelligence.json", "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+    write_json(data, output_path)
 
 def main():
     parser = argparse.ArgumentParser(description="Scrape StackOverflow questions and answers")
-    parser.add_argument('--tag', type=str, required=True, help="Which tag should be scraped")
+    parser.add_argument('--tag', type=str, required=True, choices=[*TAGS, "all"], help="Which tag should be scraped")
     args = parser.parse_args()
-    if args.tag == "ds":
-        scrape_ds()
-    elif args.tag == "ml":
-        scrape_ml()
-    elif args.tag == "ai":
-        scrape_ai()
+    
+    tags = TAGS if args.tag == "all" else {args.tag: TAGS[args.tag]}
+    # One session and thread pool for every tag, so connections are reused between them
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for tag, n_pages, output_path in tags.values():
+            scrape_tag(tag, n_pages, output_path, session=_SESSION, executor=executor)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,147 @@
 import json
-from typing import List, Dict, Set, Tuple
+from typing import Any, List, Dict, Set, Tuple, Optional, Iterator, Union, IO, ClassVar
 import hashlib
+import os
 from pathlib import Path
 from bs4 import BeautifulSoup
+import html
 import re
+import functools
+import contextlib
+import mmap
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import Counter
+from multiprocessing.pool import Pool
+import argparse
+
+# lxml builds and serialises the cleaned tree in C, BeautifulSoup is used when it isn't installed
+try:
+    from lxml import etree, html as lxml_html  #type: ignore
+except ImportError:
+    lxml_html = None
+
+# Dedup fingerprints only need speed, not collision resistance: SIMD BLAKE3 when installed, otherwise BLAKE2b
+try:
+    from blake3 import blake3  #type: ignore
+except ImportError:
+    blake3 = None  #type: ignore
+
+# Optional faster JSON encoder/decoder, the standard library json module is used without it
+try:
+    import orjson  #type: ignore
+except ImportError:
+    orjson = None  #type: ignore
+
+# Optional streaming JSON parser, so only one raw entry of a file is held in memory at a time
+try:
+    import ijson  #type: ignore
+except ImportError:
+    ijson = None
+
+# Precompiled patterns used for every question and answer
+_WS_RE = re.compile(r'\s+')
+
+# Most recent distinct HTML fragments whose cleaned form is memoised, bounded so the memo never grows to the whole corpus
+CLEAN_CACHE_SIZE = 16_384
+
+# Size in bytes of the question digests returned by hash_entry
+HASH_SIZE = 16
+
+# Bump whenever clean_file's output changes, so results cached by an older version are not served
+CACHE_VERSION = 1
+CACHE_TABLE = f'cleaned_files_v{CACHE_VERSION}'
+
+# (mtime_ns, size, cleaning and hashing backends) a cached clean_file result is valid for
+CacheKey = Tuple[int, int, str]
+
+# Parallel columns of question hashes and processed entries produced by clean_file for one input file
+CleanedFile = Tuple[List[bytes], List[Optional[Dict]]]
+
+def read_file_bytes(file_path: str) -> bytes:
+    """
+    Read a whole file with a single pread sized from fstat, skipping the buffered file object.
+    Used by map_file when a file can't be memory-mapped.
+    """
+    if not hasattr(os, 'pread'):
+        with open(file_path, 'rb') as f:
+            return f.read()
+    
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.pread(fd, size, 0)
+        # A pread can return fewer bytes than asked for, read the rest
+        while len(data) < size:
+            chunk = os.pread(fd, size - len(data), len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def map_file(file_path: str) -> Iterator[memoryview]:
+    """
+    Map a file read-only and yield a view of its bytes, so orjson parses straight from the page cache without a copy.
+    Empty files can't be mapped and yield an empty view, files that fail to map for another reason are read with read_file_bytes.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b'')
+            return
+        
+        # MAP_POPULATE faults the whole file in up front instead of one page at a time during parsing
+        try:
+            if hasattr(mmap, 'MAP_POPULATE'):
+                mapped = mmap.mmap(f.fileno(), 0, flags=mmap.MAP_SHARED | mmap.MAP_POPULATE, prot=mmap.PROT_READ)
+            else:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+    
+    if mapped is None:
+        yield memoryview(read_file_bytes(file_path))
+        return
+    
+    try:
+        with memoryview(mapped) as view:
+            yield view
+    finally:
+        mapped.close()
 
 class JSONCombiner:
-    def __init__(self):
-        self.duplicate_indices: Dict[str, List[Tuple[int, str]]] = {}
-        self.unique_entries: List[Dict] = []
-        self.hash_set: Set[str] = set()
+    # Only keep essential HTML tags for content structure
+    ALLOWED_TAGS: ClassVar[Set[str]] = {'p', 'code', 'a', 'ol', 'li', 'ul', 'strong', 'b', 'i', 'u', 'mark', 'small', 'sub', 'sup', 'span', 'table'}
+    # Elements whose class list contains js-post-notice
+    NOTICE_XPATH: ClassVar[str] = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' js-post-notice ')]"
+    
+    def __init__(self, cache_path: Optional[str] = None, track_duplicates: bool = False, processes: int = 1) -> None:
+        # With more than one process, entries are cleaned in a process pool, which only pays off with the html.parser fallback
+        self.processes: int = processes
+        
+        # Every merged file, duplicate locations refer to a file by its index in this list
+        self.file_paths: List[str] = []
+        
+        # The (index, file index) of every duplicate is only kept when asked for, otherwise just a count per question
+        self.track_duplicates: bool = track_duplicates
+        self.duplicate_indices: Dict[bytes, List[Tuple[int, int]]] = {}
+        self.duplicate_counts: 'Counter[bytes]' = Counter()
+        self.unique_count: int = 0
+        self.hash_set: Set[bytes] = set()
+        
+        # Optional sqlite cache of clean_file results, so unchanged input files are not cleaned again
+        self.cache: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            self.cache = sqlite3.connect(cache_path)
+            self.cache.execute(
+                f'CREATE TABLE IF NOT EXISTS {CACHE_TABLE} ('
+                'file_path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, cleaner TEXT, hashes BLOB, entries BLOB)'
+            )
         
-    def clean_html(self, html_content: str) -> str:
+    @staticmethod
+    def clean_html(html_content: str) -> str:
         """
         Clean HTML content by:
         1. Removing js-post-notice elements
@@ -20,32 +150,78 @@ class JSONCombiner:
         """
         if not isinstance(html_content, str):
             return ""
-            
+        
+        return JSONCombiner._clean_html_and_text(html_content)[0]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=CLEAN_CACHE_SIZE)
+    def _clean_html_and_text(html_content: str) -> Tuple[str, str]:
+        """
+        Cleans the HTML and takes the text of the cleaned tree from the same parse, returning (cleaned_html, text).
+        Memoised on the raw HTML, so repeated questions and answers aren't cleaned again while they're still in the memo.
+        """
+        if lxml_html is None:
+            cleaned_html, text = JSONCombiner._clean_html_bs4(html_content)
+        elif html_content.strip():
+            cleaned_html, text = JSONCombiner._clean_html_lxml(html_content)
+        else:
+            cleaned_html, text = "", ""
+        
+        # Clean up any extra whitespace
+        cleaned_html = _WS_RE.sub(' ', cleaned_html).strip()
+        
+        return cleaned_html, text
+    
+    @staticmethod
+    def _clean_html_lxml(html_content: str) -> Tuple[str, str]:
+        """
+        clean_html using a single lxml parse, serialised the same way as the BeautifulSoup version
+        """
+        root = lxml_html.fragment_fromstring(html_content, create_parent='div')
+        
+        # Remove all elements with class 'js-post-notice'
+        for notice in root.xpath(JSONCombiner.NOTICE_XPATH):
+            notice.drop_tree()
+        
+        # Strip attributes and unwrap the tags that aren't allowed in one pass over the elements
+        for tag in list(root.iter(etree.Element)):
+            href = tag.get('href') if tag.tag == 'a' else None
+            tag.attrib.clear()
+            if href is not None:
+                tag.set('href', href)
+            if tag is not root and tag.tag not in JSONCombiner.ALLOWED_TAGS:
+                tag.drop_tag()
+        
+        # The lxml serialiser leaves out the end tag of an empty <li>, an empty text keeps it
+        for item in root.iter('li'):
+            if item.text is None and len(item) == 0:
+                item.text = ''
+        
+        # Serialise the children of the wrapper element
+        cleaned_html = html.escape(root.text or '', quote=False) + ''.join(
+            etree.tostring(child, encoding='unicode', method='html') for child in root
+        )
+        return cleaned_html, root.text_content()
+    
+    @staticmethod
+    def _clean_html_bs4(html_content: str) -> Tuple[str, str]:
+        """
+        clean_html using BeautifulSoup, for when lxml isn't installed
+        """
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Remove all elements with class 'js-post-notice'
         for notice in soup.find_all(class_='js-post-notice'):
             notice.decompose()
             
-        # Remove unnecessary attributes from all tags
+        # Strip attributes and unwrap the tags that aren't allowed in one pass over the tags
         for tag in soup.find_all(True):
-            allowed_attrs = {'href': True} if tag.name == 'a' else {}
-            attrs = dict(tag.attrs)
-            for attr in attrs:
-                if attr not in allowed_attrs:
-                    del tag[attr]
-                    
-        # Only keep essential HTML tags
-        allowed_tags = {'p', 'code', 'a', 'ol', 'li', 'ul', 'strong', 'b', 'i', 'u', 'mark', 'small', 'sub', 'sup', 'span', 'table'}
-        for tag in soup.find_all():
-            if tag.name not in allowed_tags:
+            tag.attrs = {'href': tag.attrs['href']} if tag.name == 'a' and 'href' in tag.attrs else {}
+            if tag.name not in JSONCombiner.ALLOWED_TAGS:
                 tag.unwrap()
                 
-        # Convert back to string and clean up any extra whitespace
-        cleaned_html = str(soup)
-        cleaned_html = re.sub(r'\s+', ' ', cleaned_html).strip()
-        
-        return cleaned_html
+        # Convert back to string
+        return str(soup), soup.get_text()
     
     def clean_question_content(self, question_content: str) -> str:
         """
@@ -55,17 +231,18 @@ class JSONCombiner:
         3. Normalize whitespace
         4. Convert to lowercase
         """
-        # First remove js-post-notice elements
-        cleaned_html = self.clean_html(question_content)
-        
-        # Remove all HTML tags
-        soup = BeautifulSoup(cleaned_html, 'html.parser')
-        text = soup.get_text()
-        
-        # Normalize whitespace and convert to lowercase
-        text = re.sub(r'\s+', ' ', text).strip().lower()
+        if not isinstance(question_content, str):
+            return ""
         
-        return text
+        # Text of the tree clean_html builds, with js-post-notice elements and all HTML tags removed
+        return self.normalize_text(self._clean_html_and_text(question_content)[1])
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Convert to lowercase and normalize whitespace, str.split splits on exactly the characters \\s matches
+        """
+        return ' '.join(text.lower().split())
     
     def extract_question_content(self, entry: Dict) -> str:
         """
@@ -78,88 +255,294 @@ class JSONCombiner:
         
         return self.clean_question_content(question)
     
-    def hash_entry(self, entry: Dict) -> str:
+    @staticmethod
+    def hash_entry(text: str) -> bytes:
         """
-        Create a hash of just the question content for duplicate detection.
+        Create a hash of an entry's cleaned question content, as returned by extract_question_content, for duplicate detection.
         Ignores answers completely for duplicate checking.
+        Returns the raw 16-byte digest, which is much smaller to keep in hash_set than its hex string.
         """
-        question_content = self.extract_question_content(entry)
-        return hashlib.md5(question_content.encode()).hexdigest()
+        question_content = text.encode()
+        if blake3 is not None:
+            return blake3(question_content).digest(HASH_SIZE)
+        return hashlib.blake2b(question_content, digest_size=HASH_SIZE).digest()
     
-    def process_file(self, file_path: str, file_index: int) -> List[Dict]:
+    def iter_file_entries(self, file_path: str) -> Iterator[Dict]:
         """
-        Process a single JSON file:
-        1. Clean HTML from both questions and answers
-        2. Track duplicates based on questions only
+        Yield the entries of a JSON file, either a top-level list or the scrapers' {"items": [...]} layout.
+        With ijson installed the file is streamed, otherwise it is decoded in one go.
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
+        if ijson is not None:
+            with open(file_path, 'rb') as f:
+                # The file is read front to back in small chunks, let the kernel read ahead aggressively
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                # Peek at the first character to find where the entries live
+                head = f.read(64).lstrip(b'\xef\xbb\xbf \t\r\n')
+                prefix = 'items.item' if head.startswith(b'{') else 'item'
+                f.seek(0)
+                
+                yield from ijson.items(f, prefix, use_float=True)
+            return
+        
+        if orjson is not None:
+            with map_file(file_path) as view:
+                data = orjson.loads(view)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        
+        if isinstance(data, dict):
+            data = data.get('items', [])
+        yield from data
+    
+    @staticmethod
+    def clean_entry(entry: Dict, seen_hashes: Optional[Set[bytes]] = None) -> Tuple[bytes, Optional[Dict]]:
+        """
+        Clean a single entry, returning (hash, processed_entry). When seen_hashes is given, a question already in it
+        is returned with processed_entry set to None without cleaning its answers, and new questions are added to it.
+        """
+        # Look the question up once, a dictionary holds the actual content
+        question: Any = entry.get('question')
+        question_is_dict = isinstance(question, dict)
+        content = question.get('content', '') if question_is_dict else question
+        
+        # One cleaning gives both the stored HTML and the text the duplicate check hashes
+        if isinstance(content, str):
+            question_html, question_text = JSONCombiner._clean_html_and_text(content)
+        else:
+            question_html, question_text = "", ""
+        
+        # Check for duplicates based on the question first, so duplicates never pay for cleaning their answers
+        entry_hash = JSONCombiner.hash_entry(JSONCombiner.normalize_text(question_text))
+        
+        if seen_hashes is not None:
+            if entry_hash in seen_hashes:
+                return entry_hash, None
+            seen_hashes.add(entry_hash)
+        
+        processed_entry: Dict = {}
+        
+        # Clean question
+        if question_is_dict:
+            processed_entry['question'] = {'content': question_html}
+        elif isinstance(question, str):
+            processed_entry['question'] = question_html
+        
+        # Clean answers
+        if 'answers' in entry:
+            processed_entry['answers'] = [
+                JSONCombiner.clean_html(answer) for answer in entry['answers']
+                if isinstance(answer, str)
+            ]
+        
+        return entry_hash, processed_entry
+    
+    def clean_file(self, file_path: str, pool: Optional[Pool] = None) -> CleanedFile:
+        """
+        Load and clean a single JSON file without touching the combiner's shared state, so files can be
+        cleaned concurrently. Returns parallel columns of hashes and processed entries, indexed by the entry's
+        position in the file, with the processed entry set to None for repeats of a question seen earlier in the same file.
+        With a process pool the entries are cleaned in its workers, in chunks to keep the pickling overhead down.
+        """
+        hashes: List[bytes] = []
+        entries: List[Optional[Dict]] = []
+        seen_hashes: Set[bytes] = set()
+        
+        if pool is None:
+            for entry in self.iter_file_entries(file_path):
+                entry_hash, processed_entry = self.clean_entry(entry, seen_hashes)
+                hashes.append(entry_hash)
+                entries.append(processed_entry)
+            return hashes, entries
+        
+        # The workers can't share seen_hashes, so repeats are cleaned in full and dropped here instead
+        for entry_hash, processed_entry in pool.imap(_clean_entry, self.iter_file_entries(file_path), chunksize=256):
+            hashes.append(entry_hash)
+            if entry_hash in seen_hashes:
+                entries.append(None)
+                continue
+            seen_hashes.add(entry_hash)
+            entries.append(processed_entry)
+        
+        return hashes, entries
+    
+    def merge_file(self, file_path: str, cleaned: CleanedFile) -> List[Dict]:
+        """
+        Merge the cleaned entries of a file into the combiner, tracking duplicates based on questions only.
+        Returns the entries that are new.
+        """
+        hashes, entries = cleaned
+        file_index = len(self.file_paths)
+        self.file_paths.append(file_path)
+        
+        # clean_file already dropped repeats within the file, so the membership test against earlier
+        # files can be done for the whole hash column at once
+        seen_before = self.hash_set.intersection(hashes)
+        self.hash_set.update(hashes)
+        
         processed_entries = []
-        for idx, entry in enumerate(data):
-            processed_entry = {}
-            
-            # Clean question
-            if 'question' in entry:
-                if isinstance(entry['question'], str):
-                    processed_entry['question'] = self.clean_html(entry['question'])
-                elif isinstance(entry['question'], dict):
-                    processed_entry['question'] = {
-                        'content': self.clean_html(entry['question'].get('content', ''))
-                    }
-            
-            # Clean answers
-            if 'answers' in entry:
-                processed_entry['answers'] = [
-                    self.clean_html(answer) for answer in entry['answers']
-                    if isinstance(answer, str)
-                ]
-            
-            # Check for duplicates based on question content
-            entry_hash = self.hash_entry(processed_entry)
-            
-            if entry_hash in self.hash_set:
+        for idx, (entry_hash, processed_entry) in enumerate(zip(hashes, entries)):
+            if processed_entry is None or entry_hash in seen_before:
                 # Track duplicate
+                if not self.track_duplicates:
+                    self.duplicate_counts[entry_hash] += 1
+                    continue
                 if entry_hash not in self.duplicate_indices:
                     self.duplicate_indices[entry_hash] = []
-                self.duplicate_indices[entry_hash].append((idx, file_path))
+                self.duplicate_indices[entry_hash].append((idx, file_index))
             else:
                 # Add new unique entry
-                self.hash_set.add(entry_hash)
                 processed_entries.append(processed_entry)
-                
+        
         return processed_entries
     
+    @staticmethod
+    def file_cache_key(file_path: str) -> CacheKey:
+        """
+        Return the (mtime_ns, size, cleaner) key a cached clean_file result is valid for.
+        The lxml and BeautifulSoup cleaners don't produce identical HTML and BLAKE3 and BLAKE2b don't produce the same
+        hashes, so the cleaner records both backends and results from one combination aren't served to another.
+        """
+        stat = os.stat(file_path)
+        cleaner = 'lxml' if lxml_html is not None else 'bs4'
+        hasher = 'blake3' if blake3 is not None else 'blake2b'
+        return stat.st_mtime_ns, stat.st_size, f'{cleaner}+{hasher}-{HASH_SIZE}'
+    
+    def load_cached_file(self, file_path: str, cache_key: CacheKey) -> Optional[CleanedFile]:
+        """
+        Return the cached clean_file result for a file if it hasn't changed since it was stored, otherwise None.
+        """
+        if self.cache is None:
+            return None
+        
+        row = self.cache.execute(
+            f'SELECT hashes, entries FROM {CACHE_TABLE} WHERE file_path = ? AND mtime_ns = ? AND size = ? AND cleaner = ?',
+            (str(Path(file_path).resolve()), *cache_key)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        hashes_blob, entries_blob = row
+        hashes = [hashes_blob[i:i + HASH_SIZE] for i in range(0, len(hashes_blob), HASH_SIZE)]
+        entries = orjson.loads(entries_blob) if orjson is not None else json.loads(entries_blob)
+        return hashes, entries
+    
+    def store_cached_file(self, file_path: str, cache_key: CacheKey, cleaned: CleanedFile) -> None:
+        """
+        Store the clean_file result of a file in the cache, replacing any older result for the same path.
+        """
+        if self.cache is None:
+            return
+        
+        hashes, entries = cleaned
+        entries_blob = orjson.dumps(entries) if orjson is not None else json.dumps(entries).encode('utf-8')
+        with self.cache:
+            self.cache.execute(
+                f'INSERT OR REPLACE INTO {CACHE_TABLE} VALUES (?, ?, ?, ?, ?, ?)',
+                (str(Path(file_path).resolve()), *cache_key, b''.join(hashes), entries_blob)
+            )
+    
+    def process_file(self, file_path: str) -> List[Dict]:
+        """
+        Process a single JSON file:
+        1. Clean HTML from both questions and answers
+        2. Track duplicates based on questions only
+        """
+        return self.merge_file(file_path, self.clean_file(file_path))
+    
+    @staticmethod
+    def write_entry(output: IO, entry: Dict, first: bool) -> None:
+        """
+        Append one entry to the open output array, indented as if the whole array had been dumped with indent=2.
+        JSON strings never contain raw newlines, so indenting every line of the entry by two spaces is safe.
+        """
+        separator = '\n  ' if first else ',\n  '
+        if orjson is not None:
+            output.write(separator.encode() + orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+        else:
+            output.write(separator + json.dumps(entry, indent=2).replace('\n', '\n  '))
+    
     def combine_files(self, file_paths: List[str], output_path: str) -> Dict:
         """
         Combine multiple JSON files and remove duplicates based on questions.
         Returns statistics about the operation.
         """
         total_entries = 0
-        original_counts = {}
-        
-        # Process each file
-        for i, file_path in enumerate(file_paths):
-            entries = self.process_file(file_path, i)
-            original_counts[file_path] = len(entries)
-            total_entries += len(entries)
-            self.unique_entries.extend(entries)
-            
-        # Write combined data to output file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.unique_entries, f, indent=2)
+        original_counts: Dict[str, int] = {}
+        written = 0
+        
+        # Entries are written to the output as soon as their file is merged, so the combined data is never held in memory,
+        # only the entries of the files being cleaned and the bounded cleaning memo, which is cleared once the run ends.
+        # They go to a temporary file that only replaces the output once complete, so a failed run keeps the previous output
+        tmp_path = output_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') if orjson is not None else open(tmp_path, 'w', encoding='utf-8') as output:
+                output.write(b'[' if orjson is not None else '[')
+                
+                # Clean the files concurrently, then merge them in order so the dedup set is only used by this thread.
+                # Files that haven't changed since the last run are taken from the cache instead of being cleaned again.
+                # All files share one process pool when more than one process is asked for
+                pool_context = Pool(self.processes) if self.processes > 1 else contextlib.nullcontext()
+                with pool_context as pool, ThreadPoolExecutor(max_workers=max(1, len(file_paths))) as executor:
+                    pending: List[Tuple[str, CacheKey, Union[CleanedFile, 'Future[CleanedFile]']]] = []
+                    for file_path in file_paths:
+                        cache_key = self.file_cache_key(file_path)
+                        cached = self.load_cached_file(file_path, cache_key)
+                        source = cached if cached is not None else executor.submit(self.clean_file, file_path, pool)
+                        pending.append((file_path, cache_key, source))
+                    
+                    # Pop each file off the list so its cleaned entries are freed once they have been written
+                    while pending:
+                        file_path, cache_key, source = pending.pop(0)
+                        if isinstance(source, Future):
+                            cleaned = source.result()
+                            self.store_cached_file(file_path, cache_key, cleaned)
+                        else:
+                            cleaned = source
+                        
+                        # The hash column has one item per entry in the file, duplicates included
+                        original_counts[file_path] = len(cleaned[0])
+                        total_entries += len(cleaned[0])
+                        entries = self.merge_file(file_path, cleaned)
+                        
+                        for entry in entries:
+                            self.write_entry(output, entry, first=written == 0)
+                            written += 1
+                        del cleaned, entries, source
+                
+                closing = '\n]' if written else ']'
+                output.write(closing.encode() if orjson is not None else closing)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            self._clean_html_and_text.cache_clear()
+        
+        self.unique_count += written
             
         # Calculate statistics
         stats = {
             'original_file_counts': original_counts,
             'total_original_entries': total_entries,
-            'unique_entries': len(self.unique_entries),
-            'duplicates_removed': total_entries - len(self.unique_entries),
-            'duplicate_indices': self.duplicate_indices
+            'unique_entries': self.unique_count,
+            'duplicates_removed': total_entries - self.unique_count,
+            'file_paths': self.file_paths,
+            'duplicate_indices': self.duplicate_indices,
+            'duplicate_counts': self.duplicate_counts
         }
         
         return stats
 
+def _clean_entry(entry: Dict) -> Tuple[bytes, Optional[Dict]]:
+    """
+    Module-level JSONCombiner.clean_entry, so process pool workers can unpickle it.
+    """
+    return JSONCombiner.clean_entry(entry)
+
 def print_duplicate_report(stats: Dict) -> None:
     """
     Print a detailed report about the duplicate removal process.
@@ -173,14 +556,21 @@ def print_duplicate_report(stats: Dict) -> None:
     print(f"Unique entries: {stats['unique_entries']}")
     print(f"Duplicates removed: {stats['duplicates_removed']}")
     
-    if stats['duplicates_removed'] > 0:
+    if stats['duplicates_removed'] > 0 and not stats['duplicate_indices']:
+        print(f"Duplicate question groups: {len(stats['duplicate_counts'])} (run with --track-duplicates for their locations)")
+    elif stats['duplicates_removed'] > 0:
         print("\nDuplicate Question Groups:")
         for hash_val, locations in stats['duplicate_indices'].items():
             print(f"\nDuplicate group:")
-            for idx, file_path in locations:
-                print(f"  - Index {idx} in {Path(file_path).name}")
+            for idx, file_index in locations:
+                print(f"  - Index {idx} in {Path(stats['file_paths'][file_index]).name}")
 
-def main():
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Combine the scraped files and remove duplicate questions")
+    parser.add_argument('--track-duplicates', action='store_true', help="Record and report where every duplicate question was found")
+    parser.add_argument('--processes', type=int, default=1, help="Clean entries in this many worker processes, mostly useful when lxml isn't installed")
+    args = parser.parse_args()
+    
     # File paths
     file_paths = [
         'data/data_science.json',
@@ -189,10 +579,9 @@ def main():
     ]
     output_path = 'data/combined_data.json'
     
-    # Create and run the combiner
-    combiner = JSONCombiner()
-    
     try:
+        # Create and run the combiner
+        combiner = JSONCombiner(cache_path='data/.dedup_cache.db', track_duplicates=args.track_duplicates, processes=args.processes)
         stats = combiner.combine_files(file_paths, output_path)
         print_duplicate_report(stats)
     except Exception as e: